@@ -1,70 +1,98 @@
-import inspect
+import os
+import sys
+
+# Insert directions returned by _get_direction; they index the
+# dispatch table built by dispatch_insert().
+LEFT, RIGHT, DUPLICATE = 0, 1, 2
 
 class Node:
+    __slots__ = ('value', 'left', 'right')
+
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
 
 class BinarySearchTree:
-    def __init__(self):
+    # The external-call warning on _insert/_delete looks at the caller's
+    # frame, so it is opt-in: pass debug=True or set BST_DEBUG=1.
+    def __init__(self, debug=None):
         self.root = None
+        self._insert_handlers = self.dispatch_insert()
+        if debug is None:
+            debug = os.environ.get("BST_DEBUG", "") not in ("", "0")
+        self.debug = debug
 
     def insert(self, value):
         self.root = self._insert(self.root, value)
 
     def _insert(self, node, value):
-        # Detect external call: only warn if not called from inside this class
-        caller_frame = inspect.stack()[1]
-        caller_self = caller_frame.frame.f_locals.get('self')
-        if not isinstance(caller_self, BinarySearchTree):
-            print(f"⚠️ _insert called from outside the class (via '{caller_frame.function}')")
+        if self.debug:
+            self._warn_external_call('_insert')
 
         if node is None:
             return Node(value)
 
-        key = self._get_direction(node, value)
-        handlers = self.dispatch_insert()
-        return handlers[key](node, value)
+        # Iterative descent: each handler returns the next child to visit,
+        # or None once the value has been placed.
+        root = node
+        handlers = self._insert_handlers
+        get_direction = self._get_direction
+        while node is not None:
+            node = handlers[get_direction(node, value)](node, value)
+        return root
+
+    # Only warn if not called from inside this class
+    def _warn_external_call(self, name):
+        caller_frame = sys._getframe(2)
+        caller_self = caller_frame.f_locals.get('self')
+        if not isinstance(caller_self, BinarySearchTree):
+            print(f"⚠️ {name} called from outside the class (via '{caller_frame.f_code.co_name}')")
 
     def _get_direction(self, node, value):
         if value < node.value:
-            return 'left'
+            return LEFT
         elif value > node.value:
-            return 'right'
+            return RIGHT
         else:
-            return 'none'
+            return DUPLICATE
 
+    # Built once per tree in __init__; subclasses customise insertion by
+    # overriding the handle_*_insert methods.
     def dispatch_insert(self):
-        return {
-            'left': self.handle_left_insert,
-            'right': self.handle_right_insert,
-            'none': self.handle_duplicate_insert
-        }
+        return (
+            self.handle_left_insert,
+            self.handle_right_insert,
+            self.handle_duplicate_insert,
+        )
 
     def handle_left_insert(self, node, value):
-        node.left = self._insert(node.left, value)
-        return node
+        if node.left is None:
+            node.left = Node(value)
+            return None
+        return node.left
 
     def handle_right_insert(self, node, value):
-        node.right = self._insert(node.right, value)
-        return node
+        if node.right is None:
+            node.right = Node(value)
+            return None
+        return node.right
 
     def handle_duplicate_insert(self, node, value):
-        return node
+        return None
 
     def search(self, value):
         return self._search(self.root, value)
 
     def _search(self, node, value):
-        if node is None:
-            return False
-        if node.value == value:
-            return True
-        if value < node.value:
-            return self._search(node.left, value)
-        else:
-            return self._search(node.right, value)
+        while node is not None:
+            if node.value == value:
+                return True
+            if value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        return False
 
 # -----------------------
 # ✅ Sample Test Cases
@@ -85,5 +113,5 @@ if __name__ == "__main__":
     for v in [10, 5, 100]:
         print(f"search({v}) → {bst.search(v)}")
 
-    print("\nDirect external call to _insert (should trigger warning):")
-    bst._insert(None, 9)
+    print("\nDirect external call to _insert (should trigger warning in debug mode):")
+    BinarySearchTree(debug=True)._insert(None, 9)
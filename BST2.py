@@ -1,14 +1,28 @@
-import inspect
+import os
+import sys
+from collections import deque
+
+# Insert directions returned by _get_direction; they index the
+# dispatch table built by dispatch_insert().
+LEFT, RIGHT, DUPLICATE = 0, 1, 2
 
 class Node:
+    __slots__ = ('value', 'left', 'right')
+
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
 
 class BinarySearchTree:
-    def __init__(self):
+    # The external-call warning on _insert/_delete looks at the caller's
+    # frame, so it is opt-in: pass debug=True or set BST_DEBUG=1.
+    def __init__(self, debug=None):
         self.root = None
+        self._insert_handlers = self.dispatch_insert()
+        if debug is None:
+            debug = os.environ.get("BST_DEBUG", "") not in ("", "0")
+        self.debug = debug
 
     # Public insert
     def insert(self, value):
@@ -16,91 +30,119 @@ class BinarySearchTree:
 
     # Internal insert
     def _insert(self, node, value):
-        caller_frame = inspect.stack()[1]
-        caller_self = caller_frame.frame.f_locals.get('self')
-        if not isinstance(caller_self, BinarySearchTree):
-            print(f"⚠️ _insert called from outside the class (via '{caller_frame.function}')")
+        if self.debug:
+            self._warn_external_call('_insert')
 
         if node is None:
             return Node(value)
 
-        key = self._get_direction(node, value)
-        handlers = self.dispatch_insert()
-        return handlers[key](node, value)
+        # Iterative descent: each handler returns the next child to visit,
+        # or None once the value has been placed.
+        root = node
+        handlers = self._insert_handlers
+        get_direction = self._get_direction
+        while node is not None:
+            node = handlers[get_direction(node, value)](node, value)
+        return root
 
     def delete(self, value):
         self.root = self._delete(self.root, value)
 
     def _delete(self, node, value):
-        caller_frame = inspect.stack()[1]
-        caller_self = caller_frame.frame.f_locals.get('self')
-        if not isinstance(caller_self, BinarySearchTree):
-            print(f"⚠️ _delete called from outside the class (via '{caller_frame.function}')")
+        if self.debug:
+            self._warn_external_call('_delete')
+
+        root = node
+        parent = None
+        while node is not None:
+            if value < node.value:
+                parent = node
+                node = node.left
+            elif value > node.value:
+                parent = node
+                node = node.right
+            else:
+                break
 
         if node is None:
-            return None
-
-        if value < node.value:
-            node.left = self._delete(node.left, value)
-        elif value > node.value:
-            node.right = self._delete(node.right, value)
+            return root
+
+        # Two children: copy the in-order successor up, then unlink the
+        # successor instead (it has no left child).
+        if node.left is not None and node.right is not None:
+            parent = node
+            successor = node.right
+            while successor.left is not None:
+                parent = successor
+                successor = successor.left
+            node.value = successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if parent is None:
+            return child
+        if parent.left is node:
+            parent.left = child
         else:
-            if node.left is None and node.right is None:
-                return None
-            elif node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            else:
-                successor = self._min_value_node(node.right)
-                node.value = successor.value
-                node.right = self._delete(node.right, successor.value)
-
-        return node
+            parent.right = child
+        return root
 
     def _min_value_node(self, node):
         while node.left is not None:
             node = node.left
         return node
 
+    # Only warn if not called from inside this class
+    def _warn_external_call(self, name):
+        caller_frame = sys._getframe(2)
+        caller_self = caller_frame.f_locals.get('self')
+        if not isinstance(caller_self, BinarySearchTree):
+            print(f"⚠️ {name} called from outside the class (via '{caller_frame.f_code.co_name}')")
+
     def _get_direction(self, node, value):
         if value < node.value:
-            return 'left'
+            return LEFT
         elif value > node.value:
-            return 'right'
+            return RIGHT
         else:
-            return 'none'
+            return DUPLICATE
 
+    # Built once per tree in __init__; subclasses customise insertion by
+    # overriding the handle_*_insert methods.
     def dispatch_insert(self):
-        return {
-            'left': self.handle_left_insert,
-            'right': self.handle_right_insert,
-            'none': self.handle_duplicate_insert
-        }
+        return (
+            self.handle_left_insert,
+            self.handle_right_insert,
+            self.handle_duplicate_insert,
+        )
 
     def handle_left_insert(self, node, value):
-        node.left = self._insert(node.left, value)
-        return node
+        if node.left is None:
+            node.left = Node(value)
+            return None
+        return node.left
 
     def handle_right_insert(self, node, value):
-        node.right = self._insert(node.right, value)
-        return node
+        if node.right is None:
+            node.right = Node(value)
+            return None
+        return node.right
 
     def handle_duplicate_insert(self, node, value):
-        return node
+        return None
 
     def search(self, value):
         return self._search(self.root, value)
 
     def _search(self, node, value):
-        if node is None:
-            return False
-        if node.value == value:
-            return True
-        if value < node.value:
-            return self._search(node.left, value)
-        else:
-            return self._search(node.right, value)
+        while node is not None:
+            if node.value == value:
+                return True
+            if value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        return False
 
     def _print_node(self, node):
         print(node.value)
@@ -128,9 +170,9 @@ class BinarySearchTree:
     def _traverse_level_order(self):
         if not self.root:
             return
-        queue = [self.root]
+        queue = deque([self.root])
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             self._print_node(node)
             if node.left:
                 queue.append(node.left)
@@ -185,6 +227,7 @@ if __name__ == "__main__":
     bst.delete(8)
     bst.traverseLevelOrder()
 
-    print("\nExternal access test:")
-    bst._insert(None, 1000)
-    bst._delete(None, 2000)
+    print("\nExternal access test (debug mode):")
+    debug_bst = BinarySearchTree(debug=True)
+    debug_bst._insert(None, 1000)
+    debug_bst._delete(None, 2000)
@@ -1,4 +1,14 @@
+from collections import deque
+
+# Returned by a find() tracker to stop the traversal early.
+STOP = object()
+
+# Insert directions, used as indexes into the dispatch tuple
+LEFT, RIGHT, DUPLICATE = 0, 1, 2
+
 class Node:
+    __slots__ = ('value', 'left', 'right')
+
     def __init__(self, value):
         self.value = value
         self.left = None
@@ -7,6 +17,7 @@ class Node:
 class BinarySearchTree:
     def __init__(self):
         self.root = None
+        self._insert_handlers = self.dispatch_insert()
 
     def insert(self, value):
         self.root = self._insert(self.root, value)
@@ -16,22 +27,24 @@ class BinarySearchTree:
             return Node(value)
 
         key = self._get_direction(node, value)
-        return self.dispatch_insert()[key](node, value)
+        return self._insert_handlers[key](node, value)
 
     def _get_direction(self, node, value):
         if value < node.value:
-            return 'left'
+            return LEFT
         elif value > node.value:
-            return 'right'
+            return RIGHT
         else:
-            return 'none'
+            return DUPLICATE
 
+    # Built once per tree in __init__; subclasses customise insertion by
+    # overriding the handle_*_insert methods.
     def dispatch_insert(self):
-        return {
-            'left': self.handle_left_insert,
-            'right': self.handle_right_insert,
-            'none': self.handle_duplicate_insert
-        }
+        return (
+            self.handle_left_insert,
+            self.handle_right_insert,
+            self.handle_duplicate_insert,
+        )
 
     def handle_left_insert(self, node, value):
         node.left = self._insert(node.left, value)
@@ -113,9 +126,9 @@ class BinarySearchTree:
     def _traverse_level_order(self):
         if not self.root:
             return
-        queue = [self.root]
+        queue = deque([self.root])
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             self._print_node(node)
             if node.left:
                 queue.append(node.left)
@@ -146,35 +159,27 @@ class BinarySearchTree:
             current = current.right
         return current.value if current else None
 
+    # A tracker may return STOP to end the traversal early; any other
+    # return value (including None) continues it.
     def find(self, order, tracker_func, state):
-        self._traverse_with_tracker(self.root, order, tracker_func, state)
+        if order not in ('pre', 'in', 'post'):
+            raise ValueError(f"Unknown traversal order: {order}")
+        return self._traverse_with_tracker(self.root, order, tracker_func, state)
 
     def _traverse_with_tracker(self, node, order, tracker_func, state):
+        # Returns True once the tracker has asked to stop, so every
+        # enclosing call unwinds without visiting further nodes.
         if node is None:
-            return
-
-        def pre_order():
-            tracker_func(node, state)
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
-
-        def in_order():
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            tracker_func(node, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
-
-        def post_order():
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
-            tracker_func(node, state)
-
-        dispatch = {
-            'pre': pre_order,
-            'in': in_order,
-            'post': post_order
-        }
-
-        dispatch[order]()
+            return False
+        if order == 'pre' and tracker_func(node, state) is STOP:
+            return True
+        if self._traverse_with_tracker(node.left, order, tracker_func, state):
+            return True
+        if order == 'in' and tracker_func(node, state) is STOP:
+            return True
+        if self._traverse_with_tracker(node.right, order, tracker_func, state):
+            return True
+        return order == 'post' and tracker_func(node, state) is STOP
 
     def findSmallest(self, k):
         state = {'count': 0, 'kth': None}
@@ -183,6 +188,7 @@ class BinarySearchTree:
             state['count'] += 1
             if state['count'] == k:
                 state['kth'] = node.value
+                return STOP
 
         self.find('in', track_kth, state)
         return state['kth']
@@ -191,9 +197,10 @@ class BinarySearchTree:
         state = {'count': 0, 'sum': 0}
 
         def track_sum(node, state):
-            if state['count'] < k:
-                state['sum'] += node.value
-                state['count'] += 1
+            if state['count'] >= k:
+                return STOP
+            state['sum'] += node.value
+            state['count'] += 1
 
         self.find('in', track_sum, state)
         return state['sum']
@@ -31,125 +31,581 @@
 #
 # ================================================================
 
+import heapq
+import mmap
+import numbers
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from itertools import accumulate, islice, repeat
+from operator import attrgetter
+
+# Insert directions returned by _get_direction; they index the
+# dispatch table built by dispatch_insert().
+LEFT, RIGHT, DUPLICATE = 0, 1, 2
+
+# Returned by a find() tracker to stop the traversal early.
+STOP = object()
+
 class Node:
-    def __init__(self, value):
+    __slots__ = ('value', 'key', 'left', 'right', 'height', 'size', 'total', 'count')
+
+    # key is what the tree orders by; it defaults to the value itself
+    def __init__(self, value, key=None):
         self.value = value
+        self.key = value if key is None else key
         self.left = None
         self.right = None
+        self.height = 1
+        self.size = 1
+        self.total = 0
+        self.count = 1
+
+# Optional per-tree counters, enabled with BinarySearchTree(stats=True).
+# Every operation records how many nodes it visited. Descents that steer
+# by key compare each visited node's key once (three-way), so their
+# visits also count as comparisons; findSmallest/sumSmaller steer by
+# subtree sizes and find() traversals compare nothing. Only root-to-leaf
+# descents feed the depth figures, not traversals.
+class TreeStats:
+    __slots__ = ('operations', 'visited', 'comparisons', 'descents', 'depth_total',
+                 'max_depth', 'rotations', 'allocations', 'rebuilds')
 
-class BinarySearchTree:
     def __init__(self):
+        self.operations = {}
+        self.visited = {}
+        self.comparisons = 0
+        self.descents = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.rotations = 0
+        self.allocations = 0
+        self.rebuilds = 0
+
+    def record(self, operation, visited, descent=True, compares=True):
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+        self.visited[operation] = self.visited.get(operation, 0) + visited
+        if compares:
+            self.comparisons += visited
+        if descent:
+            self.descents += 1
+            self.depth_total += visited
+            if visited > self.max_depth:
+                self.max_depth = visited
+
+    def snapshot(self):
+        return {
+            'operations': dict(self.operations),
+            'nodes_visited': dict(self.visited),
+            'comparisons': self.comparisons,
+            'avg_depth': self.depth_total / self.descents if self.descents else 0.0,
+            'max_depth': self.max_depth,
+            'rotations': self.rotations,
+            'allocations': self.allocations,
+            'rebuilds': self.rebuilds
+        }
+
+class BinarySearchTree:
+    node_class = Node
+
+    # Batches at least 1/batch_rebuild_factor the size of the tree are
+    # merged with its in-order sequence and the tree is rebuilt.
+    batch_rebuild_factor = 4
+
+    # balanced=True keeps the tree AVL-balanced so height stays O(log n),
+    # even when values arrive in sorted order.
+    # track_sum=True keeps subtree sums so sumSmaller/sum_range are
+    # O(log n). The default, None, turns them on only if the first key
+    # inserted is a number, so dates or strings never get added up; with
+    # sums off, sumSmaller/sum_range walk the values instead.
+    # multiset=True counts repeated values on a single node instead of
+    # dropping them; sizes, sums and iteration include the multiplicity.
+    # key, as for sorted(), is applied once per inserted value and cached
+    # on its node. Lookups (search, delete, floor, range, rank...) then
+    # take keys, as bisect does, and sums add up keys. Keys must be
+    # unique: a value whose key is already present is dropped, like any
+    # other duplicate. A node keeps only one value, so key can't be
+    # combined with multiset, which would repeat the first value in
+    # place of the others.
+    # stats=True attaches a TreeStats; when off, each operation pays a
+    # single attribute check. When on, queries run counting copies of
+    # their loops (the *_with_stats methods), so the plain loops carry no
+    # counters.
+    def __init__(self, balanced=False, track_sum=None, multiset=False, key=None, stats=False):
+        if multiset and key is not None:
+            raise ValueError("multiset=True can't be combined with a key function")
         self.root = None
+        self.balanced = balanced
+        self.track_sum = track_sum
+        self.multiset = multiset
+        self.key = key
+        self.stats = TreeStats() if stats else None
+        self._insert_handlers = self.dispatch_insert()
+
+    # -----------------------
+    # Bulk loading
+    # -----------------------
+    # Both build a height-optimal tree directly from the sorted values,
+    # without descending once per value. Duplicates are dropped, or
+    # counted in multiset mode.
+
+    @classmethod
+    def from_sorted(cls, values, **options):
+        tree = cls(**options)
+        nodes = [tree._new_node(value) for value in values]
+        tree.root = tree._build_sorted(tree._dedupe_sorted(nodes))
+        return tree
+
+    # Sorts the nodes rather than the values so key is called once each
+    @classmethod
+    def from_iterable(cls, values, **options):
+        tree = cls(**options)
+        nodes = sorted(map(tree._new_node, values), key=attrgetter('key'))
+        tree.root = tree._build_sorted(tree._dedupe_sorted(nodes))
+        return tree
+
+    # Equal neighbours are merged into the first one through
+    # handle_duplicate_insert, exactly as a repeated insert would be.
+    def _dedupe_sorted(self, nodes):
+        unique = []
+        for node in nodes:
+            if unique:
+                last = unique[-1]
+                if node.key < last.key:
+                    raise ValueError("from_sorted() needs values in ascending order")
+                if node.key == last.key:
+                    self.handle_duplicate_insert(last, node)
+                    continue
+            unique.append(node)
+        return unique
+
+    # Links already sorted nodes into a height-optimal tree
+    def _build_sorted(self, nodes, lo=0, hi=None):
+        if hi is None:
+            hi = len(nodes)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._build_sorted(nodes, lo, mid)
+        node.right = self._build_sorted(nodes, mid + 1, hi)
+        self._update(node)
+        return node
+
+    # -----------------------
+    # Snapshots
+    # -----------------------
+    # dump() writes the distinct keys in order as one packed array, so
+    # load() is a bulk load with no per-key descent. See DUMP_HEADER for
+    # the layout; bst_frozen queries the same file in place.
+
+    def dump(self, path):
+        if self.key is not None or self.node_class is not Node:
+            raise TypeError("dump() only supports plain trees of numbers")
+        nodes = list(self._inorder_nodes(self.root))
+        keys = [node.key for node in nodes]
+        typecode = _dump_typecode(keys)
+
+        # Everything is packed before the file is touched, and written to a
+        # temporary file that replaces path only once complete, so a failed
+        # dump leaves the previous snapshot intact.
+        try:
+            sections = [array(typecode, keys)]
+        except OverflowError:
+            raise ValueError("dump() keys must fit in a 64-bit int or a double") from None
+        if self.multiset:
+            sections.append(array('q', accumulate(node.count for node in nodes)))
+        flags = (self.balanced and DUMP_BALANCED) | (bool(self.track_sum) and DUMP_TRACK_SUM) \
+            | (self.multiset and DUMP_MULTISET) | (sys.byteorder == 'big' and DUMP_BIG_ENDIAN)
+        header = DUMP_HEADER.pack(DUMP_MAGIC, DUMP_VERSION, typecode.encode(), flags, len(keys))
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(header)
+                for section in sections:
+                    f.write(section.tobytes())
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    # Options given here override the ones stored in the file. A multiset
+    # snapshot loaded with multiset=False keeps one of each value.
+    @classmethod
+    def load(cls, path, **options):
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            typecode, flags, length = _read_dump_header(mapped)
+            stored = {
+                'balanced': bool(flags & DUMP_BALANCED),
+                'track_sum': bool(flags & DUMP_TRACK_SUM),
+                'multiset': bool(flags & DUMP_MULTISET)
+            }
+            tree = cls(**dict(stored, **options))
+            with memoryview(mapped) as view:
+                end = DUMP_HEADER.size + 8 * length
+                with view[DUMP_HEADER.size:end].cast(typecode) as keys:
+                    nodes = [tree._new_node(key) for key in keys.tolist()]
+                if flags & DUMP_MULTISET and tree.multiset:
+                    with view[end:end + 8 * length].cast('q') as counts:
+                        previous = 0
+                        for node, running in zip(nodes, counts.tolist()):
+                            node.count = running - previous
+                            previous = running
+        tree.root = tree._build_sorted(nodes)
+        return tree
+
+    # Dumps to path and maps it back as a read-only bst_frozen.FrozenTree
+    def freeze(self, path):
+        from bst_frozen import FrozenTree
+        self.dump(path)
+        return FrozenTree(path)
 
     def insert(self, value):
-        self.root = self._insert(self.root, value)
+        self.root = self._insert(self.root, self._new_node(value))
 
-    def _insert(self, node, value):
-        if node is None:
-            return Node(value)
-        key = self._get_direction(node, value)
-        return self.dispatch_insert()[key](node, value)
-
-    def _get_direction(self, node, value):
-        if value < node.value:
-            return 'left'
-        elif value > node.value:
-            return 'right'
+    def _new_node(self, value):
+        if self.stats is not None:
+            self.stats.allocations += 1
+        if self.key is None:
+            node = self.node_class(value)
         else:
-            return 'none'
+            node = self.node_class(value, self.key(value))
+        if self.track_sum is None:
+            self.track_sum = isinstance(node.key, numbers.Number)
+        if self.track_sum:
+            node.total = node.key
+        return node
+
+    # Iterative descent: new is a detached node carrying the value. Each
+    # handler either returns the child to descend into next, or None once
+    # new has been linked in (or merged into an equal node).
+    def _insert(self, node, new):
+        path = []
+        handlers = self._insert_handlers
+        get_direction = self._get_direction
+        while node is not None:
+            path.append(node)
+            node = handlers[get_direction(node, new)](node, new)
 
+        if self.stats is not None:
+            self.stats.record('insert', len(path))
+        if not path:
+            return new
+        return self._retrace(path)
+
+    def _get_direction(self, node, new):
+        if new.key < node.key:
+            return LEFT
+        elif new.key > node.key:
+            return RIGHT
+        else:
+            return DUPLICATE
+
+    # Built once per tree in __init__; subclasses customise insertion by
+    # overriding the handle_*_insert methods.
     def dispatch_insert(self):
-        return {
-            'left': self.handle_left_insert,
-            'right': self.handle_right_insert,
-            'none': self.handle_duplicate_insert
-        }
+        return (
+            self.handle_left_insert,
+            self.handle_right_insert,
+            self.handle_duplicate_insert,
+        )
 
-    def handle_left_insert(self, node, value):
-        node.left = self._insert(node.left, value)
-        return node
+    def handle_left_insert(self, node, new):
+        if node.left is None:
+            node.left = new
+            return None
+        return node.left
 
-    def handle_right_insert(self, node, value):
-        node.right = self._insert(node.right, value)
-        return node
+    def handle_right_insert(self, node, new):
+        if node.right is None:
+            node.right = new
+            return None
+        return node.right
 
-    def handle_duplicate_insert(self, node, value):
-        return node
+    def handle_duplicate_insert(self, node, new):
+        if self.multiset:
+            node.count += new.count
+        return None
 
     def delete(self, value):
         self.root = self._delete(self.root, value)
 
     def _delete(self, node, value):
+        root = node
+        path = []
+        while node is not None:
+            if value < node.key:
+                path.append(node)
+                node = node.left
+            elif value > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+
+        if self.stats is not None:
+            self.stats.record('delete', len(path) + (node is not None))
         if node is None:
-            return None
-        if value < node.value:
-            node.left = self._delete(node.left, value)
-        elif value > node.value:
-            node.right = self._delete(node.right, value)
+            return root
+
+        if node.count > 1:
+            node.count -= 1
+            path.append(node)
+            return self._retrace(path)
+
+        parent = path[-1] if path else None
+        if node.left is None or node.right is None:
+            replacement = node.left if node.left is not None else node.right
+        else:
+            # Two children: unlink the in-order successor (it has no left
+            # child) and move that node into the deleted node's place.
+            index = len(path)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            if path[-1] is node:
+                node.right = successor.right
+            else:
+                path[-1].left = successor.right
+            successor.left = node.left
+            successor.right = node.right
+            path[index] = successor
+            replacement = successor
+
+        if parent is None:
+            root = replacement
+        elif parent.left is node:
+            parent.left = replacement
         else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            successor = self._min_value_node(node.right)
-            node.value = successor.value
-            node.right = self._delete(node.right, successor.value)
+            parent.right = replacement
+
+        if not path:
+            return root
+        return self._retrace(path)
+
+    # Walk a descent path bottom-up, rebalancing each node and re-linking
+    # it to its parent when a rotation moved a new node into its place.
+    def _retrace(self, path):
+        node = None
+        for i in range(len(path) - 1, -1, -1):
+            node = self._rebalance(path[i])
+            if i and node is not path[i]:
+                parent = path[i - 1]
+                if parent.left is path[i]:
+                    parent.left = node
+                else:
+                    parent.right = node
         return node
 
+    # -----------------------
+    # Batch operations
+    # -----------------------
+    # Each sorts its batch once. Inserts and deletes either apply the
+    # sorted keys one by one, or for large batches rebuild the tree from
+    # a single merge of the batch with the current in-order sequence.
+
+    def insert_many(self, values):
+        return self._insert_nodes([self._new_node(value) for value in self._as_list(values)])
+
+    def _insert_nodes(self, nodes):
+        by_key = attrgetter('key')
+        batch = self._dedupe_sorted(sorted(nodes, key=by_key))
+        before = len(self)
+        if len(batch) * self.batch_rebuild_factor >= before:
+            merged = heapq.merge(self._rebuild_nodes(), batch, key=by_key)
+            self.root = self._build_sorted(self._dedupe_sorted(merged))
+            if self.stats is not None:
+                self.stats.rebuilds += 1
+        else:
+            for node in batch:
+                # Merged duplicates may have raised the node's count
+                self._update(node)
+                self.root = self._insert(self.root, node)
+        return len(self) - before
+
+    def delete_many(self, values):
+        batch = sorted(self._as_list(values))
+        before = len(self)
+        if len(batch) * self.batch_rebuild_factor >= before:
+            kept = []
+            i = 0
+            for node in self._rebuild_nodes():
+                while i < len(batch) and batch[i] < node.key:
+                    i += 1
+                j = i
+                while j < len(batch) and batch[j] == node.key:
+                    j += 1
+                # Each listed occurrence removes one copy of the value
+                if j - i < node.count:
+                    node.count -= j - i
+                    kept.append(node)
+                i = j
+            self.root = self._build_sorted(kept)
+            if self.stats is not None:
+                self.stats.rebuilds += 1
+        else:
+            for value in batch:
+                self.root = self._delete(self.root, value)
+        return before - len(self)
+
+    # The current nodes in order, for a rebuild to relink in place
+    def _rebuild_nodes(self):
+        return self._inorder_nodes(self.root)
+
+    # Membership for every value, in input order. The sorted batch is
+    # split at each visited node, so keys share the descent down to
+    # where their paths diverge.
+    def contains_many(self, values):
+        values = self._as_list(values)
+        order = sorted(range(len(values)), key=values.__getitem__)
+        keys = [values[i] for i in order]
+        found = [False] * len(keys)
+        if self.stats is not None:
+            self._shared_descent_with_stats(keys, found)
+        else:
+            stack = [(self.root, 0, len(keys))]
+            while stack:
+                node, lo, hi = stack.pop()
+                if node is None or lo >= hi:
+                    continue
+                i = bisect_left(keys, node.key, lo, hi)
+                j = bisect_right(keys, node.key, i, hi)
+                for x in range(i, j):
+                    found[x] = True
+                stack.append((node.left, lo, i))
+                stack.append((node.right, j, hi))
+
+        results = [False] * len(values)
+        for position, index in enumerate(order):
+            results[index] = found[position]
+        return results
+
+    def _shared_descent_with_stats(self, keys, found):
+        visited = 0
+        stack = [(self.root, 0, len(keys))]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node is None or lo >= hi:
+                continue
+            visited += 1
+            i = bisect_left(keys, node.key, lo, hi)
+            j = bisect_right(keys, node.key, i, hi)
+            for x in range(i, j):
+                found[x] = True
+            stack.append((node.left, lo, i))
+            stack.append((node.right, j, hi))
+        self.stats.record('contains_many', visited, descent=False)
+
+    # NumPy arrays are converted to plain Python scalars first
+    def _as_list(self, values):
+        if hasattr(values, 'tolist'):
+            return values.tolist()
+        return list(values)
+
     def _min_value_node(self, node):
         while node.left:
             node = node.left
         return node
 
+    def _max_value_node(self, node):
+        while node.right:
+            node = node.right
+        return node
+
+    # -----------------------
+    # Subtree augmentation and AVL balancing
+    # -----------------------
+
+    def _height(self, node):
+        return node.height if node else 0
+
+    # Recompute height, size and sum of a node from its children.
+    def _update(self, node):
+        left, right = node.left, node.right
+        height, size = 0, node.count
+        if left is not None:
+            height = left.height
+            size += left.size
+        if right is not None:
+            if right.height > height:
+                height = right.height
+            size += right.size
+        node.height = height + 1
+        node.size = size
+
+        if self.track_sum:
+            total = node.key * node.count
+            if left is not None:
+                total += left.total
+            if right is not None:
+                total += right.total
+            node.total = total
+
+    def _balance_factor(self, node):
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        if self.stats is not None:
+            self.stats.rotations += 1
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        if self.stats is not None:
+            self.stats.rotations += 1
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        self._update(node)
+        if not self.balanced:
+            return node
+
+        balance = self._balance_factor(node)
+
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+
+        return node
+
     def _print_node(self, node):
         print(node.value)
 
     def traverse(self, order):
         if order in ("in", "pre", "post"):
-            self._traverse_recursive(self.root, order)
+            for node in self._iter_nodes(order, self.root):
+                self._print_node(node)
         elif order == "level":
             self._traverse_level_order()
         else:
             print(f"Unknown traversal order: {order}")
 
-    def _traverse_recursive(self, node, order):
-        if node is None:
-            return
-
-        def pre_order():
-            self._print_node(node)
-            self._traverse_recursive(node.left, order)
-            self._traverse_recursive(node.right, order)
-
-        def in_order():
-            self._traverse_recursive(node.left, order)
-            self._print_node(node)
-            self._traverse_recursive(node.right, order)
-
-        def post_order():
-            self._traverse_recursive(node.left, order)
-            self._traverse_recursive(node.right, order)
-            self._print_node(node)
-
-        dispatch = {
-            'pre': pre_order,
-            'in': in_order,
-            'post': post_order
-        }
-
-        dispatch[order]()
-
     def _traverse_level_order(self):
-        if not self.root:
-            return
-        queue = [self.root]
-        while queue:
-            node = queue.pop(0)
+        for node in self._levelorder_nodes(self.root):
             self._print_node(node)
-            if node.left:
-                queue.append(node.left)
-            if node.right:
-                queue.append(node.right)
 
     def traverseInOrder(self):
         self.traverse("in")
@@ -163,6 +619,128 @@ class BinarySearchTree:
     def traverseLevelOrder(self):
         self.traverse("level")
 
+    # -----------------------
+    # Lazy traversal iterators
+    # -----------------------
+    # Each walks an explicit stack (or queue for level order), so memory
+    # stays O(height) and callers can stop consuming at any point.
+
+    def iter_inorder(self):
+        return self._node_values(self._inorder_nodes(self.root))
+
+    def iter_preorder(self):
+        return self._node_values(self._preorder_nodes(self.root))
+
+    def iter_postorder(self):
+        return self._node_values(self._postorder_nodes(self.root))
+
+    def iter_levelorder(self):
+        return self._node_values(self._levelorder_nodes(self.root))
+
+    # One list of node values per depth, root first
+    def iter_levels(self):
+        for level in self._level_batches(self.root):
+            yield [node.value for node in level]
+
+    # Shape summary gathered from a single level-order pass
+    def level_stats(self):
+        widths = [len(level) for level in self._level_batches(self.root)]
+        return {
+            'nodes': sum(widths),
+            'height': len(widths),
+            'width': max(widths, default=0),
+            'level_widths': widths
+        }
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def __reversed__(self):
+        return self._node_values(self._inorder_nodes(self.root, reverse=True))
+
+    # Each value is repeated by its multiplicity in multiset mode
+    def _node_values(self, nodes):
+        if self.multiset:
+            for node in nodes:
+                yield from repeat(node.value, node.count)
+        else:
+            for node in nodes:
+                yield node.value
+
+    def _node_keys(self, nodes):
+        for node in nodes:
+            yield from repeat(node.key, node.count)
+
+    def _iter_nodes(self, order, node):
+        dispatch = {
+            'pre': self._preorder_nodes,
+            'in': self._inorder_nodes,
+            'post': self._postorder_nodes,
+            'level': self._levelorder_nodes
+        }
+        if order not in dispatch:
+            raise ValueError(f"Unknown traversal order: {order}")
+        return dispatch[order](node)
+
+    def _inorder_nodes(self, node, reverse=False):
+        stack = []
+        while True:
+            while node is not None:
+                stack.append(node)
+                node = node.right if reverse else node.left
+            if not stack:
+                return
+            node = stack.pop()
+            yield node
+            node = node.left if reverse else node.right
+
+    def _preorder_nodes(self, node):
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def _postorder_nodes(self, node):
+        stack = []
+        last = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right is not None and top.right is not last:
+                node = top.right
+            else:
+                last = stack.pop()
+                yield last
+
+    def _levelorder_nodes(self, node):
+        queue = deque([node] if node is not None else [])
+        while queue:
+            node = queue.popleft()
+            yield node
+            if node.left is not None:
+                queue.append(node.left)
+            if node.right is not None:
+                queue.append(node.right)
+
+    def _level_batches(self, node):
+        level = [node] if node is not None else []
+        while level:
+            yield level
+            next_level = []
+            for node in level:
+                if node.left is not None:
+                    next_level.append(node.left)
+                if node.right is not None:
+                    next_level.append(node.right)
+            level = next_level
+
     def findMinimum(self):
         current = self.root
         while current and current.left:
@@ -175,57 +753,749 @@ class BinarySearchTree:
             current = current.right
         return current.value if current else None
 
+    # A tracker may return STOP to end the traversal early; any other
+    # return value (including None) continues it. Returns True if stopped.
     def find(self, order, tracker_func, state):
-        self._traverse_with_tracker(self.root, order, tracker_func, state)
+        return self._traverse_with_tracker(self.root, order, tracker_func, state)
 
     def _traverse_with_tracker(self, node, order, tracker_func, state):
-        if node is None:
-            return
+        if self.stats is not None:
+            return self._traverse_with_stats(node, order, tracker_func, state)
+        for node in self._iter_nodes(order, node):
+            if tracker_func(node, state) is STOP:
+                return True
+        return False
 
-        def pre_order():
-            tracker_func(node, state)
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
+    # Kept apart so the untracked loop above stays as tight as before
+    def _traverse_with_stats(self, node, order, tracker_func, state):
+        visited = 0
+        stopped = False
+        for node in self._iter_nodes(order, node):
+            visited += 1
+            if tracker_func(node, state) is STOP:
+                stopped = True
+                break
+        self.stats.record('find', visited, descent=False, compares=False)
+        return stopped
 
-        def in_order():
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            tracker_func(node, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
+    # -----------------------
+    # Search and nearest-value queries
+    # -----------------------
+    # Each is a single root-to-leaf descent, O(height). The nearest-value
+    # queries return None when no such value exists.
 
-        def post_order():
-            self._traverse_with_tracker(node.left, order, tracker_func, state)
-            self._traverse_with_tracker(node.right, order, tracker_func, state)
-            tracker_func(node, state)
+    def search(self, value):
+        return self._search(self.root, value) is not None
 
-        dispatch = {
-            'pre': pre_order,
-            'in': in_order,
-            'post': post_order
-        }
+    def _search(self, node, value):
+        if self.stats is not None:
+            return self._search_with_stats(node, value)
+        while node is not None:
+            if value < node.key:
+                node = node.left
+            elif value > node.key:
+                node = node.right
+            else:
+                return node
+        return None
 
-        dispatch[order]()
+    # Largest value <= value
+    def floor(self, value):
+        if self.stats is not None:
+            return self._nearest_with_stats('floor', value, True, False)
+        best = None
+        node = self.root
+        while node is not None:
+            if value < node.key:
+                node = node.left
+            elif value > node.key:
+                best = node
+                node = node.right
+            else:
+                return node.value
+        return best.value if best else None
 
-    def findSmallest(self, k):
-        state = {'count': 0, 'kth': None}
+    # Smallest value >= value
+    def ceiling(self, value):
+        if self.stats is not None:
+            return self._nearest_with_stats('ceiling', value, False, False)
+        best = None
+        node = self.root
+        while node is not None:
+            if value < node.key:
+                best = node
+                node = node.left
+            elif value > node.key:
+                node = node.right
+            else:
+                return node.value
+        return best.value if best else None
+
+    # Largest value strictly smaller than value
+    def predecessor(self, value):
+        if self.stats is not None:
+            return self._nearest_with_stats('predecessor', value, True, True)
+        best = None
+        node = self.root
+        while node is not None:
+            if value < node.key:
+                node = node.left
+            elif value > node.key:
+                best = node
+                node = node.right
+            else:
+                if node.left is not None:
+                    best = self._max_value_node(node.left)
+                break
+        return best.value if best else None
 
-        def track_kth(node, state):
-            state['count'] += 1
-            if state['count'] == k:
-                state['kth'] = node.value
+    # Smallest value strictly greater than value
+    def successor(self, value):
+        if self.stats is not None:
+            return self._nearest_with_stats('successor', value, False, True)
+        best = None
+        node = self.root
+        while node is not None:
+            if value < node.key:
+                best = node
+                node = node.left
+            elif value > node.key:
+                node = node.right
+            else:
+                if node.right is not None:
+                    best = self._min_value_node(node.right)
+                break
+        return best.value if best else None
 
-        self.find('in', track_kth, state)
-        return state['kth']
+    # Order statistics below use the subtree sizes and sums kept by
+    # _update, so each runs in O(height).
+    def findSmallest(self, k):
+        if self.stats is not None:
+            return self._find_smallest_with_stats(k)
+        node = self.root
+        while node is not None:
+            left_size = node.left.size if node.left else 0
+            if k <= left_size:
+                node = node.left
+            elif k <= left_size + node.count:
+                return node.value
+            else:
+                k -= left_size + node.count
+                node = node.right
+        return None
 
     def sumSmaller(self, k):
-        state = {'count': 0, 'sum': 0}
+        if not self.track_sum:
+            return sum(islice(self._node_keys(self._inorder_nodes(self.root)), max(k, 0)))
+        if self.stats is not None:
+            return self._sum_smaller_with_stats(k)
+
+        total = 0
+        node = self.root
+        while node is not None and k > 0:
+            left = node.left
+            left_size = left.size if left else 0
+            if k <= left_size:
+                node = left
+            else:
+                taken = min(k - left_size, node.count)
+                if left is not None:
+                    total += left.total
+                total += node.key * taken
+                k -= left_size + taken
+                node = node.right
+        return total
+
+    # Multiplicity of value: 0 or 1 unless in multiset mode
+    def count(self, value):
+        node = self._search(self.root, value)
+        return node.count if node else 0
+
+    # Number of values strictly smaller than value
+    def rank(self, value):
+        return self._count_below(value)
+
+    # The two helpers below count or sum the values below value (or up to
+    # it, inclusive) from whole left subtrees along a single descent.
+
+    def _count_below(self, value, inclusive=False):
+        if self.stats is not None:
+            return self._below_with_stats('count_below', value, inclusive)
+        count = 0
+        node = self.root
+        while node is not None:
+            if value < node.key or (value == node.key and not inclusive):
+                node = node.left
+            else:
+                count += node.left.size + node.count if node.left else node.count
+                node = node.right
+        return count
+
+    def _sum_below(self, value, inclusive=False):
+        if self.stats is not None:
+            return self._below_with_stats('sum_below', value, inclusive)
+        total = 0
+        node = self.root
+        while node is not None:
+            if value < node.key or (value == node.key and not inclusive):
+                node = node.left
+            else:
+                if node.left is not None:
+                    total += node.left.total
+                total += node.key * node.count
+                node = node.right
+        return total
+
+    # Counting copies of the queries above, used instead of them when
+    # stats are on. Each reads self.root once and walks it a single time.
+
+    def _search_with_stats(self, node, value):
+        visited = 0
+        while node is not None:
+            visited += 1
+            if value < node.key:
+                node = node.left
+            elif value > node.key:
+                node = node.right
+            else:
+                break
+        self.stats.record('search', visited)
+        return node
+
+    # floor/ceiling (strict False) and predecessor/successor (strict True);
+    # below picks the side of value the answer lies on
+    def _nearest_with_stats(self, operation, value, below, strict):
+        visited = 0
+        best = None
+        node = self.root
+        while node is not None:
+            visited += 1
+            if value < node.key:
+                if not below:
+                    best = node
+                node = node.left
+            elif value > node.key:
+                if below:
+                    best = node
+                node = node.right
+            else:
+                if not strict:
+                    best = node
+                elif below and node.left is not None:
+                    best = self._max_value_node(node.left)
+                elif not below and node.right is not None:
+                    best = self._min_value_node(node.right)
+                break
+        self.stats.record(operation, visited)
+        return best.value if best else None
+
+    def _find_smallest_with_stats(self, k):
+        visited = 0
+        node = self.root
+        while node is not None:
+            visited += 1
+            left_size = node.left.size if node.left else 0
+            if k <= left_size:
+                node = node.left
+            elif k <= left_size + node.count:
+                break
+            else:
+                k -= left_size + node.count
+                node = node.right
+        self.stats.record('findSmallest', visited, compares=False)
+        return node.value if node else None
+
+    def _sum_smaller_with_stats(self, k):
+        visited = 0
+        total = 0
+        node = self.root
+        while node is not None and k > 0:
+            visited += 1
+            left = node.left
+            left_size = left.size if left else 0
+            if k <= left_size:
+                node = left
+            else:
+                taken = min(k - left_size, node.count)
+                if left is not None:
+                    total += left.total
+                total += node.key * taken
+                k -= left_size + taken
+                node = node.right
+        self.stats.record('sumSmaller', visited, compares=False)
+        return total
+
+    def _below_with_stats(self, operation, value, inclusive):
+        visited = 0
+        result = 0
+        summed = operation == 'sum_below'
+        node = self.root
+        while node is not None:
+            visited += 1
+            if value < node.key or (value == node.key and not inclusive):
+                node = node.left
+            else:
+                left = node.left
+                if summed:
+                    result += node.key * node.count + (left.total if left else 0)
+                else:
+                    result += node.count + (left.size if left else 0)
+                node = node.right
+        self.stats.record(operation, visited)
+        return result
+
+    # -----------------------
+    # Range queries over [lo, hi]
+    # -----------------------
+
+    def range(self, lo, hi):
+        return self._node_values(self._range_nodes(lo, hi))
+
+    # Nodes in order, skipping subtrees that lie wholly outside the bounds
+    def _range_nodes(self, lo, hi):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+                continue
+            node = stack.pop()
+            if node.key > hi:
+                return
+            yield node
+            node = node.right
+
+    def count_range(self, lo, hi):
+        if hi < lo:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo)
+
+    def sum_range(self, lo, hi):
+        if hi < lo:
+            return 0
+        if not self.track_sum:
+            return sum(self._node_keys(self._range_nodes(lo, hi)))
+        return self._sum_below(hi, inclusive=True) - self._sum_below(lo)
+
+    # -----------------------
+    # Split, join and set operations
+    # -----------------------
+    # These move nodes between trees instead of allocating new ones, and
+    # empty the trees they take nodes from. On balanced trees split and
+    # join are O(log n) and the set operations O(m log(n/m + 1)) through
+    # join-based recursion; when either tree is unbalanced they use a
+    # linear merge of the in-order nodes and come out height-optimal.
+    # Both trees must agree on multiset, key and map type.
+
+    # Returns (keys < key, keys >= key) as two new trees
+    def split(self, key):
+        less, match, greater = self._split3(self.root, key)
+        if match is not None:
+            greater = self._join(None, match, greater)
+        self.root = None
+        left, right = self._empty_like(), self._empty_like()
+        left.root, right.root = less, greater
+        return left, right
+
+    # Appends other, whose keys must all be greater than this tree's
+    def join(self, other):
+        if self.root is not None and other.root is not None and \
+                self._max_value_node(self.root).key >= self._min_value_node(other.root).key:
+            raise ValueError("join() needs every key in other to be greater than every key here")
+        if self._joinable(other):
+            self.root = self._join2(self.root, other.root)
+        else:
+            nodes = [self._own(node) for node in self._inorder_nodes(self.root)]
+            nodes.extend(self._own(node) for node in self._inorder_nodes(other.root))
+            self.root = self._build_sorted(nodes)
+        other.root = None
+
+    # Duplicates merge through handle_duplicate_insert, as for insert
+    def union(self, other):
+        return self._combine(other, self._union, self._union_sorted)
+
+    # Multisets keep the smaller count; maps keep this tree's payloads
+    def intersection(self, other):
+        return self._combine(other, self._intersection, self._intersection_sorted)
+
+    # Multisets subtract counts
+    def difference(self, other):
+        return self._combine(other, self._difference, self._difference_sorted)
+
+    def _empty_like(self):
+        return type(self)(balanced=self.balanced, track_sum=self.track_sum, multiset=self.multiset,
+                          key=self.key, stats=self.stats is not None)
+
+    # Nodes from an existing tree pass through here before they are
+    # changed; copy-on-write trees copy them instead.
+    def _own(self, node):
+        return node
+
+    # Nodes move from other into this tree, so both must order, count and
+    # carry payloads alike. Linking other's subtrees in as they are keeps
+    # this tree's invariants only if other is balanced whenever this one
+    # is, and keeps the same sums; otherwise the callers relink every node.
+    def _joinable(self, other):
+        if self.node_class is not other.node_class or self.multiset != other.multiset \
+                or self.key != other.key:
+            raise ValueError("Trees must agree on multiset, key and map type")
+        # A tree that is still empty has not decided on sums yet
+        if self.track_sum is None:
+            self.track_sum = other.track_sum
+        return (other.balanced or not self.balanced) and other.track_sum in (None, self.track_sum)
+
+    def _combine(self, other, joined, merged):
+        if other is self:
+            raise ValueError("Set operations need two different trees")
+        joinable = self._joinable(other)
+        a, b = self.root, other.root
+        self.root = other.root = None
+        result = self._empty_like()
+        if self.balanced and joinable:
+            result.root = joined(a, b)
+        else:
+            result.root = merged([self._own(node) for node in self._inorder_nodes(a)],
+                                 [self._own(node) for node in self._inorder_nodes(b)])
+        return result
+
+    # Splits around key, detaching the node equal to it (or None) as
+    # (less, match, greater). The descent is unwound bottom-up, joining
+    # each node on the path to the side it belongs to.
+    def _split3(self, node, key):
+        path = []
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+
+        less = greater = match = None
+        if node is not None:
+            match = self._own(node)
+            less, greater = match.left, match.right
+            match.left = match.right = None
+            self._update(match)
+        for node in reversed(path):
+            if key < node.key:
+                greater = self._join(greater, node, node.right)
+            else:
+                less = self._join(node.left, node, less)
+        return less, match, greater
+
+    # Links left < pivot < right. When balanced and the heights differ
+    # by more than one, pivot is hung off the taller tree's inner spine.
+    def _join(self, left, pivot, right):
+        pivot = self._own(pivot)
+        if self.balanced:
+            if self._height(left) > self._height(right) + 1:
+                return self._join_right(left, pivot, right)
+            if self._height(right) > self._height(left) + 1:
+                return self._join_left(left, pivot, right)
+        pivot.left, pivot.right = left, right
+        self._update(pivot)
+        return pivot
+
+    def _join_right(self, left, pivot, right):
+        limit = self._height(right) + 1
+        path = []
+        node = self._own(left)
+        while self._height(node) > limit:
+            path.append(node)
+            child = self._own(node.right)
+            node.right = child
+            node = child
+        pivot.left, pivot.right = node, right
+        self._update(pivot)
+        path[-1].right = pivot
+        return self._retrace(path)
+
+    def _join_left(self, left, pivot, right):
+        limit = self._height(left) + 1
+        path = []
+        node = self._own(right)
+        while self._height(node) > limit:
+            path.append(node)
+            child = self._own(node.left)
+            node.left = child
+            node = child
+        pivot.left, pivot.right = left, node
+        self._update(pivot)
+        path[-1].left = pivot
+        return self._retrace(path)
+
+    # Join without a pivot: the largest node of left becomes the pivot
+    def _join2(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        left, pivot = self._pop_max(left)
+        return self._join(left, pivot, right)
+
+    # Detaches the largest node, returning (rest of the tree, node)
+    def _pop_max(self, node):
+        path = []
+        node = self._own(node)
+        while node.right is not None:
+            path.append(node)
+            child = self._own(node.right)
+            node.right = child
+            node = child
+        rest = node.left
+        node.left = None
+        if path:
+            path[-1].right = rest
+            rest = self._retrace(path)
+        return rest, node
+
+    # Join-based set operations: split b around a's root, recurse on
+    # both halves and join the results back around it. Recursion depth
+    # is bounded by the height of a, which balancing keeps logarithmic.
+
+    def _union(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        a = self._own(a)
+        less, match, greater = self._split3(b, a.key)
+        left, right = a.left, a.right
+        if match is not None:
+            self.handle_duplicate_insert(a, match)
+        return self._join(self._union(left, less), a, self._union(right, greater))
+
+    def _intersection(self, a, b):
+        if a is None or b is None:
+            return None
+        a = self._own(a)
+        less, match, greater = self._split3(b, a.key)
+        left = self._intersection(a.left, less)
+        right = self._intersection(a.right, greater)
+        if match is None:
+            return self._join2(left, right)
+        a.count = min(a.count, match.count)
+        return self._join(left, a, right)
+
+    def _difference(self, a, b):
+        if a is None or b is None:
+            return a
+        a = self._own(a)
+        less, match, greater = self._split3(b, a.key)
+        left = self._difference(a.left, less)
+        right = self._difference(a.right, greater)
+        if match is not None:
+            if a.count <= match.count:
+                return self._join2(left, right)
+            a.count -= match.count
+        return self._join(left, a, right)
+
+    # Linear versions over the two sorted node lists
+
+    def _union_sorted(self, a, b):
+        return self._build_sorted(self._dedupe_sorted(heapq.merge(a, b, key=attrgetter('key'))))
 
-        def track_sum(node, state):
-            if state['count'] < k:
-                state['sum'] += node.value
-                state['count'] += 1
+    def _intersection_sorted(self, a, b):
+        kept = []
+        j = 0
+        for node in a:
+            while j < len(b) and b[j].key < node.key:
+                j += 1
+            if j < len(b) and b[j].key == node.key:
+                node.count = min(node.count, b[j].count)
+                kept.append(node)
+        return self._build_sorted(kept)
 
-        self.find('in', track_sum, state)
-        return state['sum']
+    def _difference_sorted(self, a, b):
+        kept = []
+        j = 0
+        for node in a:
+            while j < len(b) and b[j].key < node.key:
+                j += 1
+            if j < len(b) and b[j].key == node.key:
+                if node.count <= b[j].count:
+                    continue
+                node.count -= b[j].count
+            kept.append(node)
+        return self._build_sorted(kept)
+
+    def __len__(self):
+        root = self.root
+        return root.size if root else 0
+
+    # Counters plus the current shape, as a plain dict for export
+    def stats_snapshot(self):
+        if self.stats is None:
+            return None
+        root = self.root
+        snapshot = self.stats.snapshot()
+        snapshot['size'] = root.size if root else 0
+        snapshot['height'] = root.height if root else 0
+        return snapshot
+
+
+# -----------------------
+# Snapshot file format
+# -----------------------
+# Header, then `length` sorted distinct keys as 8-byte ints ('q') or
+# doubles ('d'), then for multisets `length` running totals of the
+# counts ('q'), so the k-th smallest is a bisect away. Arrays are in
+# the writer's byte order, recorded in the flags.
+
+DUMP_HEADER = struct.Struct('<4sBcBxQ')  # magic, version, typecode, flags, length
+DUMP_MAGIC = b'BST6'
+DUMP_VERSION = 1
+DUMP_BALANCED, DUMP_TRACK_SUM, DUMP_MULTISET, DUMP_BIG_ENDIAN = 1, 2, 4, 8
+
+
+# Ints are stored as ints; any float in the tree stores all keys as
+# doubles, which only works if every int survives the trip to a float
+def _dump_typecode(keys):
+    has_float = False
+    for key in keys:
+        if isinstance(key, float):
+            has_float = True
+        elif not isinstance(key, int):
+            raise TypeError(f"dump() only supports int and float keys, not {type(key).__name__}")
+    if has_float:
+        for key in keys:
+            if isinstance(key, int) and not _exact_as_float(key):
+                raise ValueError(f"dump() can't store {key} exactly next to float keys")
+        return 'd'
+    return 'q'
+
+
+def _exact_as_float(value):
+    try:
+        return int(float(value)) == value
+    except OverflowError:
+        return False
+
+
+def _read_dump_header(buffer):
+    if len(buffer) < DUMP_HEADER.size:
+        raise ValueError("Not a BST6 snapshot: file too short")
+    magic, version, typecode, flags, length = DUMP_HEADER.unpack_from(buffer)
+    if magic != DUMP_MAGIC:
+        raise ValueError("Not a BST6 snapshot: bad magic")
+    if version != DUMP_VERSION:
+        raise ValueError(f"Unsupported BST6 snapshot version {version}")
+    if bool(flags & DUMP_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise ValueError("BST6 snapshot was written with a different byte order")
+    expected = DUMP_HEADER.size + 8 * length * (2 if flags & DUMP_MULTISET else 1)
+    if len(buffer) < expected:
+        raise ValueError("Truncated BST6 snapshot")
+    return typecode.decode(), flags, length
+
+
+class MapNode(Node):
+    __slots__ = ('payload',)
+
+    def __init__(self, value, key=None, payload=None):
+        super().__init__(value, key)
+        self.payload = payload
+
+
+# Mapping views that walk the nodes once in order, rather than looking
+# every key up again as the generic views do.
+class MapItemsView(ItemsView):
+    def __iter__(self):
+        for node in self._mapping._inorder_nodes(self._mapping.root):
+            yield node.value, node.payload
+
+
+class MapValuesView(ValuesView):
+    def __iter__(self):
+        for node in self._mapping._inorder_nodes(self._mapping.root):
+            yield node.payload
+
+
+# Ordered dictionary: each node's value is the key and it carries the
+# payload, so a single descent serves both lookup and ordering. Keys are
+# iterated in sorted order. Sums are off by default since keys are often
+# strings.
+class BinarySearchTreeMap(BinarySearchTree, MutableMapping):
+    node_class = MapNode
+
+    def __init__(self, items=(), balanced=False, track_sum=False, stats=False):
+        super().__init__(balanced=balanced, track_sum=track_sum, stats=stats)
+        self.update(items)
+
+    def _empty_like(self):
+        return type(self)(balanced=self.balanced, track_sum=self.track_sum, stats=self.stats is not None)
+
+    def _new_node(self, value, payload=None):
+        node = super()._new_node(value)
+        node.payload = payload
+        return node
+
+    # Inserting an existing key replaces its payload
+    def handle_duplicate_insert(self, node, new):
+        node.payload = new.payload
+        return None
+
+    # Set-style inserts add missing keys with a None payload and leave
+    # existing payloads alone; m[key] = payload replaces them.
+    def insert(self, key):
+        if key not in self:
+            super().insert(key)
+
+    def insert_many(self, keys):
+        return super().insert_many([key for key in self._as_list(keys) if key not in self])
+
+    def __getitem__(self, key):
+        node = self._search(self.root, key)
+        if node is None:
+            raise KeyError(key)
+        return node.payload
+
+    def __setitem__(self, key, payload):
+        self.root = self._insert(self.root, self._new_node(key, payload))
+
+    def __delitem__(self, key):
+        size = len(self)
+        self.delete(key)
+        if len(self) == size:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self._search(self.root, key) is not None
+
+    def get(self, key, default=None):
+        node = self._search(self.root, key)
+        return default if node is None else node.payload
+
+    def setdefault(self, key, default=None):
+        node = self._search(self.root, key)
+        if node is not None:
+            return node.payload
+        self[key] = default
+        return default
+
+    # Applied as one batch; later entries win, as with dict.update
+    def update(self, items=(), **kwargs):
+        if isinstance(items, Mapping):
+            items = items.items()
+        nodes = [self._new_node(key, payload) for key, payload in items]
+        nodes.extend(self._new_node(key, payload) for key, payload in kwargs.items())
+        if nodes:
+            self._insert_nodes(nodes)
+
+    def items(self):
+        return MapItemsView(self)
+
+    def values(self):
+        return MapValuesView(self)
+
+    def clear(self):
+        self.root = None
 
 
 # -----------------------
@@ -254,6 +1524,17 @@ if __name__ == "__main__":
     print("Maximum:", bst.findMaximum())
     print("3rd Smallest:", bst.findSmallest(3))
     print("Sum of first 5 smallest:", bst.sumSmaller(5))
+    print("Rank of 6:", bst.rank(6))
+
+    def track_first_above(node, state):
+        state['visited'] += 1
+        if node.value > state['limit']:
+            state['found'] = node.value
+            return STOP
+
+    state = {'limit': 4, 'found': None, 'visited': 0}
+    bst.find('in', track_first_above, state)
+    print("First value above 4:", state['found'], f"(visited {state['visited']} nodes)")
 
     print("\nDeleting 3 and 7:")
     bst.delete(3)
@@ -261,3 +1542,86 @@ if __name__ == "__main__":
 
     print("\nInOrder After Deletion:")
     bst.traverseInOrder()
+
+    print("\nLazy iterators:")
+    print("In-order:", list(bst))
+    print("Reversed:", list(reversed(bst)))
+    print("Pre-order:", list(bst.iter_preorder()))
+    print("Post-order:", list(bst.iter_postorder()))
+    print("Level-order:", list(bst.iter_levelorder()))
+    print("Levels:", list(bst.iter_levels()))
+    print("Level stats:", bst.level_stats())
+
+    print("\nBatch operations:")
+    print("Inserted:", bst.insert_many([10, 3, 12, 10, 7]))
+    print("Deleted:", bst.delete_many([1, 12, 100]))
+    print("Contains 3, 9, 10:", bst.contains_many([3, 9, 10]))
+    print("In-order:", list(bst))
+
+    print("\nRange [3, 7]:", list(bst.range(3, 7)))
+    print("Count in [3, 7]:", bst.count_range(3, 7))
+    print("Sum in [3, 7]:", bst.sum_range(3, 7))
+
+    print("\nSearch 5:", bst.search(5), "| Search 9:", bst.search(9))
+    print("Floor 9:", bst.floor(9), "| Ceiling 9:", bst.ceiling(9))
+    print("Predecessor 5:", bst.predecessor(5), "| Successor 5:", bst.successor(5))
+
+    print("\nRecords ordered by a key function:")
+    people = BinarySearchTree(key=lambda person: person['age'])
+    people.insert_many([{'name': 'ann', 'age': 34}, {'name': 'ben', 'age': 27}, {'name': 'cy', 'age': 45}])
+    print("Youngest:", people.findMinimum()['name'], "| Oldest at or under 40:", people.floor(40)['name'])
+    print("Total age of 2 youngest:", people.sumSmaller(2))
+
+    print("\nMultiset of event counts:")
+    events = BinarySearchTree.from_iterable([3, 1, 3, 2, 3, 1], multiset=True)
+    print("In-order:", list(events))
+    print("count(3):", events.count(3), "| len:", len(events))
+    print("4th Smallest:", events.findSmallest(4), "| Sum of first 4:", events.sumSmaller(4))
+    events.delete(3)
+    print("After deleting one 3:", list(events.range(2, 3)))
+
+    print("\nOrdered map:")
+    ages = BinarySearchTreeMap({'carol': 41, 'alice': 30}, balanced=True)
+    ages['bob'] = 25
+    ages['alice'] = 31
+    print("Items:", list(ages.items()))
+    print("ages['bob']:", ages['bob'], "| get('dave'):", ages.get('dave'))
+    print("setdefault('dave', 0):", ages.setdefault('dave', 0))
+    del ages['carol']
+    print("Keys after deleting carol:", list(ages))
+
+    print("\nBulk load from unsorted values with duplicates:")
+    loaded = BinarySearchTree.from_iterable([9, 3, 7, 3, 1, 9, 5], balanced=True)
+    print("In-order:", list(loaded))
+    print("Levels:", list(loaded.iter_levels()))
+
+    print("\nSnapshot round trip:")
+    import tempfile
+    snapshot = os.path.join(tempfile.mkdtemp(), 'events.bst')
+    events.dump(snapshot)
+    restored = BinarySearchTree.load(snapshot)
+    print("Restored:", list(restored), "multiset:", restored.multiset)
+    os.remove(snapshot)
+
+    print("\nSplit, join and set operations:")
+    evens = BinarySearchTree.from_iterable(range(0, 20, 2), balanced=True)
+    low, high = evens.split(10)
+    print("split(10):", list(low), list(high))
+    low.join(high)
+    print("Joined back:", list(low))
+    threes = BinarySearchTree.from_iterable(range(0, 20, 3), balanced=True)
+    print("Union with multiples of 3:", list(low.union(threes)))
+    evens = BinarySearchTree.from_iterable(range(0, 20, 2), balanced=True)
+    threes = BinarySearchTree.from_iterable(range(0, 20, 3), balanced=True)
+    print("Intersection:", list(evens.intersection(threes)))
+
+    print("\nBalanced tree with sorted input 1 to 5000:")
+    balanced = BinarySearchTree(balanced=True, stats=True)
+    for v in range(1, 5001):
+        balanced.insert(v)
+    print("Height:", balanced.root.height)
+    print("Minimum:", balanced.findMinimum())
+    print("Maximum:", balanced.findMaximum())
+    print("1000th Smallest:", balanced.findSmallest(1000))
+    print("Sum of first 1000 smallest:", balanced.sumSmaller(1000))
+    print("Stats:", balanced.stats_snapshot())
@@ -0,0 +1,331 @@
+# -----------------------
+# Benchmarks
+#
+# Run with:  python benchmark.py [--size N]
+#
+# Full suite across every implementation, workload and size, with
+# JSON output for regression comparison:
+#
+#   python benchmark.py --suite --sizes 1000 10000 100000 --json new.json
+#   python benchmark.py --suite --json new.json --compare old.json
+# -----------------------
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import BST
+import BST2
+import BST4
+import BST5
+import BST6
+
+
+def time_inserts(tree, keys):
+    start = time.perf_counter()
+    for k in keys:
+        tree.insert(k)
+    return time.perf_counter() - start
+
+
+def report(label, count, elapsed):
+    print(f"{label:<32} {elapsed:8.3f}s  {count / elapsed:12,.0f} ops/s")
+
+
+def bench_insert(size, seed=0):
+    rng = random.Random(seed)
+    keys = rng.sample(range(size * 10), size)
+
+    print(f"\nInsert throughput, {size:,} random keys:")
+    for module in (BST, BST2):
+        for debug in (False, True):
+            tree = module.BinarySearchTree(debug=debug)
+            label = f"{module.__name__} (debug={debug})"
+            report(label, size, time_inserts(tree, keys))
+
+
+def bench_bulk_load(size):
+    keys = list(range(size))
+
+    print(f"\nLoading {size:,} sorted keys into BST6 (balanced):")
+    tree = BST6.BinarySearchTree(balanced=True)
+    report("insert loop", size, time_inserts(tree, keys))
+
+    start = time.perf_counter()
+    BST6.BinarySearchTree.from_sorted(keys, balanced=True)
+    report("from_sorted", size, time.perf_counter() - start)
+
+
+def bench_memory(size, seed=0):
+    rng = random.Random(seed)
+    keys = rng.sample(range(size * 10), size)
+
+    print(f"\nMemory per key, {size:,} random keys (tracemalloc):")
+    for module in (BST, BST2, BST4, BST5, BST6):
+        tree = module.BinarySearchTree()
+        tracemalloc.start()
+        for k in keys:
+            tree.insert(k)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{module.__name__:<32} {used / size:8.1f} bytes/key")
+
+
+def bench_snapshot(size, seed=0):
+    rng = random.Random(seed)
+    keys = rng.sample(range(size * 10), size)
+    tree = BST6.BinarySearchTree.from_iterable(keys, balanced=True)
+
+    print(f"\nRestoring {size:,} keys into BST6 (balanced):")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.bst")
+        report("insert replay", size, time_inserts(BST6.BinarySearchTree(balanced=True), keys))
+
+        start = time.perf_counter()
+        tree.dump(path)
+        report("dump", size, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        BST6.BinarySearchTree.load(path)
+        report("load", size, time.perf_counter() - start)
+
+
+def floor_by_traversal(tree, value):
+    best = None
+    for v in tree.iter_inorder():
+        if v > value:
+            break
+        best = v
+    return best
+
+
+def bench_nearest(size, seed=0, queries=200):
+    rng = random.Random(seed)
+    tree = BST6.BinarySearchTree.from_iterable(rng.sample(range(size * 10), size))
+    probes = [rng.randrange(size * 10) for _ in range(queries)]
+
+    print(f"\nfloor() on {size:,} keys, {queries} queries:")
+    start = time.perf_counter()
+    expected = [floor_by_traversal(tree, p) for p in probes]
+    report("in-order traversal", queries, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    found = [tree.floor(p) for p in probes]
+    report("floor()", queries, time.perf_counter() - start)
+    assert found == expected
+
+
+# -----------------------
+# Suite
+# -----------------------
+
+# Name -> (tree factory, stays balanced on sorted input)
+IMPLEMENTATIONS = {
+    "BST": (BST.BinarySearchTree, False),
+    "BST2": (BST2.BinarySearchTree, False),
+    "BST4": (BST4.BinarySearchTree, False),
+    "BST5": (BST5.BinarySearchTree, False),
+    "BST6": (BST6.BinarySearchTree, False),
+    "BST6-balanced": (lambda: BST6.BinarySearchTree(balanced=True), True),
+}
+
+# findSmallest walks the tree in order here, so each query is O(k)
+WALKING_RANK = {"BST4", "BST5"}
+
+WORKLOADS = ("random", "sorted", "reverse", "zipf")
+
+
+def make_keys(workload, size, rng):
+    if workload == "random":
+        return rng.sample(range(size * 10), size)
+    if workload == "sorted":
+        return list(range(size))
+    if workload == "reverse":
+        return list(range(size, 0, -1))
+    if workload == "zipf":
+        # Zipf(s=1.1) over a shuffled key space, so hot keys repeat
+        ranks = list(range(size))
+        rng.shuffle(ranks)
+        weights = itertools.accumulate(1 / (r + 1) ** 1.1 for r in range(size))
+        return rng.choices(ranks, cum_weights=list(weights), k=size)
+    raise ValueError(f"Unknown workload: {workload}")
+
+
+def measure(op, items):
+    samples = []
+    clock = time.perf_counter_ns
+    for item in items:
+        start = clock()
+        op(item)
+        samples.append(clock() - start)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] / 1000
+
+    return {
+        "ops": len(ordered),
+        "seconds": total / 1e9,
+        "ops_per_sec": len(ordered) / (total / 1e9) if total else None,
+        "p50_us": percentile(0.50),
+        "p90_us": percentile(0.90),
+        "p99_us": percentile(0.99),
+        "max_us": ordered[-1] / 1000,
+    }
+
+
+# The implementations expose different subsets of the API, so each
+# operation is looked up on the tree and skipped when missing.
+def suite_operations(tree, keys, rng, rank_queries=10_000):
+    lookups = keys[:]
+    rng.shuffle(lookups)
+    unique = len(set(keys))
+    ranks = [rng.randint(1, unique) for _ in range(min(len(keys), rank_queries))]
+
+    ops = [("insert", tree.insert, keys)]
+    if hasattr(tree, "search"):
+        ops.append(("search", tree.search, lookups))
+    if hasattr(tree, "findSmallest"):
+        ops.append(("rank", tree.findSmallest, ranks))
+    if hasattr(tree, "iter_inorder"):
+        ops.append(("traverse", lambda _: sum(1 for _ in tree.iter_inorder()), [None]))
+    elif hasattr(tree, "find"):
+        ops.append(("traverse", lambda _: tree.find("in", lambda node, state: None, None), [None]))
+    if hasattr(tree, "delete"):
+        ops.append(("delete", tree.delete, lookups))
+    return ops
+
+
+def peak_build_memory(factory, keys):
+    tree = factory()
+    tracemalloc.start()
+    for k in keys:
+        tree.insert(k)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run_case(name, workload, size, seed, max_degenerate, max_walk_ranks):
+    factory, balanced = IMPLEMENTATIONS[name]
+    base = {"impl": name, "workload": workload, "size": size}
+
+    # Sorted input turns the unbalanced trees into O(n) chains, which is
+    # quadratic to build; only measure those up to max_degenerate keys.
+    if not balanced and workload in ("sorted", "reverse") and size > max_degenerate:
+        return [dict(base, op="*", skipped=f"degenerate above {max_degenerate} keys")]
+
+    rng = random.Random(seed)
+    keys = make_keys(workload, size, rng)
+    tree = factory()
+    # O(k) rank queries would dominate the run; ask fewer of them
+    rank_queries = max_walk_ranks if name in WALKING_RANK else 10_000
+    results = []
+    try:
+        for op_name, op, items in suite_operations(tree, keys, rng, rank_queries):
+            stats = summarize(measure(op, items))
+            if op_name == "traverse":
+                # A single full pass; report nodes visited per second
+                stats["ops_per_sec"] = len(set(keys)) / stats["seconds"]
+            results.append(dict(base, op=op_name, **stats))
+        peak = peak_build_memory(factory, keys)
+        results.append(dict(base, op="memory", peak_bytes=peak, bytes_per_key=peak / size))
+    except RecursionError:
+        results.append(dict(base, op="*", error="RecursionError"))
+    return results
+
+
+def print_result(result):
+    label = f"{result['impl']:<14} {result['workload']:<8} {result['size']:>9,} {result['op']:<9}"
+    if "error" in result or "skipped" in result:
+        print(f"{label} {result.get('error') or result['skipped']}")
+    elif result["op"] == "memory":
+        print(f"{label} peak {result['peak_bytes']:>14,} B  {result['bytes_per_key']:8.1f} B/key")
+    else:
+        print(f"{label} {result['ops_per_sec']:>12,.0f} ops/s  "
+              f"p50 {result['p50_us']:8.2f}us  p99 {result['p99_us']:8.2f}us")
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    def case(r):
+        return (r["impl"], r["workload"], r["size"], r["op"])
+
+    before = {case(r): r for r in baseline if r.get("ops_per_sec")}
+    print(f"\nThroughput change vs {baseline_path}:")
+    for r in results:
+        old = before.get(case(r))
+        if old and r.get("ops_per_sec"):
+            change = (r["ops_per_sec"] / old["ops_per_sec"] - 1) * 100
+            print(f"{r['impl']:<14} {r['workload']:<8} {r['size']:>9,} {r['op']:<9} {change:+7.1f}%")
+
+
+def run_suite(args):
+    results = []
+    for size in args.sizes:
+        for workload in args.workloads:
+            for name in args.impls:
+                for result in run_case(name, workload, size, args.seed, args.max_degenerate,
+                                       args.max_walk_ranks):
+                    print_result(result)
+                    results.append(result)
+
+    if args.json:
+        report = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary search tree benchmarks")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--suite", action="store_true",
+                        help="run every implementation over every workload")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--impls", nargs="+", choices=list(IMPLEMENTATIONS),
+                        default=list(IMPLEMENTATIONS))
+    parser.add_argument("--max-degenerate", type=int, default=10_000,
+                        help="largest sorted/reverse input for unbalanced trees")
+    parser.add_argument("--max-walk-ranks", type=int, default=100,
+                        help="rank queries for trees whose findSmallest walks in order")
+    parser.add_argument("--json", help="write suite results to this file")
+    parser.add_argument("--compare", help="baseline suite JSON to compare against")
+    args = parser.parse_args()
+
+    if args.suite:
+        run_suite(args)
+        return
+
+    bench_insert(args.size, args.seed)
+    bench_bulk_load(args.size)
+    bench_memory(args.size, args.seed)
+    bench_snapshot(args.size, args.seed)
+    bench_nearest(args.size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# -----------------------
+# asyncio front end
+# -----------------------
+# AsyncBinarySearchTree wraps a BST6 tree for use from an event loop.
+# ingest() consumes an async stream of ('insert' | 'delete', value)
+# pairs and applies each run of the same operation as one
+# insert_many/delete_many call. Traversals are async iterators that
+# hand control back to the loop every yield_every values, so walking
+# a huge tree does not stall other tasks.
+#
+# All tree work runs on the loop thread; single-descent queries are
+# O(log n) and cheaper than a hop through run_in_executor.
+#
+# Iterators pause at every yield, so the tree may be written before they
+# resume. The default copy-on-write tree lets each iterator walk its own
+# snapshot. Any other tree is walked live, and, like a dict, the
+# iterator raises RuntimeError if the wrapper wrote to the tree since it
+# started.
+
+import asyncio
+
+from bst_concurrent import CopyOnWriteBinarySearchTree
+
+# Marks the end of the values in _yielding
+_DONE = object()
+
+
+class AsyncBinarySearchTree:
+    def __init__(self, tree=None, batch_size=1024, yield_every=1024):
+        self.tree = CopyOnWriteBinarySearchTree() if tree is None else tree
+        self.batch_size = batch_size
+        self.yield_every = yield_every
+        # Bumped on every write, so live iterators can tell they are stale
+        self._writes = 0
+        self._appliers = {
+            'insert': self.tree.insert_many,
+            'delete': self.tree.delete_many
+        }
+
+    # Returns how many values were inserted and removed. A pending run is
+    # applied when the operation changes, when it reaches batch_size, and
+    # when the stream ends. Batches are not rolled back: an unknown
+    # operation raises ValueError once everything before it is applied.
+    async def ingest(self, operations):
+        changed = dict.fromkeys(self._appliers, 0)
+        pending_op, pending = None, []
+        async for op, value in operations:
+            if op not in self._appliers:
+                if pending:
+                    self._apply(pending_op, pending)
+                raise ValueError(f"Unknown operation: {op!r}")
+            if op != pending_op or len(pending) >= self.batch_size:
+                if pending:
+                    changed[pending_op] += self._apply(pending_op, pending)
+                    await asyncio.sleep(0)
+                pending_op, pending = op, []
+            pending.append(value)
+        if pending:
+            changed[pending_op] += self._apply(pending_op, pending)
+        return changed
+
+    def _apply(self, op, values):
+        self._writes += 1
+        return self._appliers[op](values)
+
+    async def insert(self, value):
+        self._writes += 1
+        self.tree.insert(value)
+
+    async def delete(self, value):
+        self._writes += 1
+        self.tree.delete(value)
+
+    async def search(self, value):
+        return self.tree.search(value)
+
+    async def findSmallest(self, k):
+        return self.tree.findSmallest(k)
+
+    async def sumSmaller(self, k):
+        return self.tree.sumSmaller(k)
+
+    async def count_range(self, lo, hi):
+        return self.tree.count_range(lo, hi)
+
+    async def sum_range(self, lo, hi):
+        return self.tree.sum_range(lo, hi)
+
+    async def range(self, lo, hi):
+        return [value async for value in self.iter_range(lo, hi)]
+
+    # Returns the tree to walk and, for a live tree, the write count to
+    # check against (None for a private snapshot)
+    def _source(self):
+        snapshot = getattr(self.tree, 'snapshot', None)
+        if snapshot is not None:
+            return snapshot(), None
+        return self.tree, self._writes
+
+    def iter_inorder(self):
+        tree, writes = self._source()
+        return self._yielding(tree.iter_inorder(), writes)
+
+    def iter_range(self, lo, hi):
+        tree, writes = self._source()
+        return self._yielding(tree.range(lo, hi), writes)
+
+    def __aiter__(self):
+        return self.iter_inorder()
+
+    # The consumer may await between values too, and the iterator may be
+    # created well before its first value is pulled, so a live walk is
+    # checked before every node is read, the first one included.
+    async def _yielding(self, values, writes):
+        values = iter(values)
+        every = self.yield_every
+        count = 0
+        while True:
+            if writes is not None and self._writes != writes:
+                raise RuntimeError("tree changed during iteration")
+            value = next(values, _DONE)
+            if value is _DONE:
+                return
+            yield value
+            count += 1
+            if count % every == 0:
+                await asyncio.sleep(0)
+
+
+if __name__ == "__main__":
+    import random
+
+    async def stream(count):
+        for i in range(count):
+            yield ('insert', random.randrange(100_000))
+            if i % 10 == 9:
+                yield ('delete', random.randrange(100_000))
+            if i % 500 == 0:
+                await asyncio.sleep(0)  # the socket would block here
+
+    async def heartbeat(ticks):
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        tree = AsyncBinarySearchTree(CopyOnWriteBinarySearchTree(balanced=True), yield_every=500)
+        changed = await tree.ingest(stream(20_000))
+        print("Applied:", changed, "| size:", len(tree.tree))
+        print("10th Smallest:", await tree.findSmallest(10), "| Sum of first 10:", await tree.sumSmaller(10))
+        print("Range 0..1000:", len(await tree.range(0, 1000)), "values")
+
+        # Other tasks keep running while a full traversal is consumed
+        ticks = []
+        beat = asyncio.ensure_future(heartbeat(ticks))
+        total = 0
+        async for value in tree:
+            total += 1
+        beat.cancel()
+        print("Traversed:", total, "values | heartbeat ran", len(ticks), "times meanwhile")
+
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+# -----------------------
+# Thread-safe trees
+# -----------------------
+# CopyOnWriteBinarySearchTree never changes a node that is reachable
+# from a published root. Every write copies the nodes it would modify
+# (the descent path, the successor chain on delete, rotated nodes and
+# anything relinked by a batch rebuild), then publishes the new root
+# with a single attribute store.
+#
+# ConcurrentBinarySearchTree adds a writer lock on top. Readers take no
+# lock at all: each query reads self.root once and then walks nodes that
+# can no longer change, so it sees one complete version of the tree.
+# Reads scale with threads, including on free-threaded builds.
+
+import threading
+
+from BST6 import BinarySearchTree, Node
+
+
+class CopyOnWriteBinarySearchTree(BinarySearchTree):
+    def _copy(self, node):
+        clone = object.__new__(type(node))
+        clone.value = node.value
+        clone.key = node.key
+        clone.left = node.left
+        clone.right = node.right
+        clone.height = node.height
+        clone.size = node.size
+        clone.total = node.total
+        clone.count = node.count
+        if type(node) is not Node:
+            clone.payload = node.payload
+        return clone
+
+    # Copies the nodes a descent for key visits and links the copies
+    # together. With successor=True the in-order successor chain of a
+    # two-child match is copied too, as _delete relinks it.
+    def _copy_path(self, node, key, successor=False):
+        root = parent = None
+        left = False
+        while node is not None:
+            clone = self._copy(node)
+            if parent is None:
+                root = clone
+            elif left:
+                parent.left = clone
+            else:
+                parent.right = clone
+            parent = clone
+
+            if key < node.key:
+                left, node = True, node.left
+            elif key > node.key:
+                left, node = False, node.right
+            elif successor and node.left is not None and node.right is not None:
+                # Step right once, then copy the left spine below it
+                parent.right = clone = self._copy(node.right)
+                while clone.left is not None:
+                    clone.left = clone = self._copy(clone.left)
+                break
+            else:
+                break
+        return root
+
+    # The base algorithms then only ever touch the private copies
+    def _insert(self, node, new):
+        return super()._insert(self._copy_path(node, new.key), new)
+
+    def _delete(self, node, value):
+        return super()._delete(self._copy_path(node, value, successor=True), value)
+
+    # A rotation can pull in a sibling that is not on the copied path
+    def _rotate_left(self, node):
+        node = self._copy(node)
+        node.right = self._copy(node.right)
+        return super()._rotate_left(node)
+
+    def _rotate_right(self, node):
+        node = self._copy(node)
+        node.left = self._copy(node.left)
+        return super()._rotate_right(node)
+
+    # Batch rebuilds relink and merge copies, never the live nodes
+    def _rebuild_nodes(self):
+        return map(self._copy, super()._rebuild_nodes())
+
+    # Split, join and the set operations change nodes only through _own
+    def _own(self, node):
+        return self._copy(node) if node is not None else None
+
+    # O(1): the new tree shares every node with this one, and writes to
+    # either copy their paths, so neither can see the other's updates.
+    def snapshot(self):
+        tree = CopyOnWriteBinarySearchTree(balanced=self.balanced, track_sum=self.track_sum,
+                                           multiset=self.multiset, key=self.key)
+        tree.root = self.root
+        return tree
+
+
+class ConcurrentBinarySearchTree(CopyOnWriteBinarySearchTree):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._write_lock = threading.Lock()
+
+    def insert(self, value):
+        with self._write_lock:
+            super().insert(value)
+
+    def delete(self, value):
+        with self._write_lock:
+            super().delete(value)
+
+    def insert_many(self, values):
+        with self._write_lock:
+            return super().insert_many(values)
+
+    def delete_many(self, values):
+        with self._write_lock:
+            return super().delete_many(values)
+
+    # Only this tree's lock is taken; other must not be written meanwhile
+    def split(self, key):
+        with self._write_lock:
+            return super().split(key)
+
+    def join(self, other):
+        with self._write_lock:
+            super().join(other)
+
+    def union(self, other):
+        with self._write_lock:
+            return super().union(other)
+
+    def intersection(self, other):
+        with self._write_lock:
+            return super().intersection(other)
+
+    def difference(self, other):
+        with self._write_lock:
+            return super().difference(other)
+
+    # Both bounds must be read from the same version
+    def count_range(self, lo, hi):
+        return self.snapshot().count_range(lo, hi)
+
+    def sum_range(self, lo, hi):
+        return self.snapshot().sum_range(lo, hi)
+
+
+if __name__ == "__main__":
+    import random
+
+    tree = ConcurrentBinarySearchTree(balanced=True)
+    keys = list(range(20000))
+    random.shuffle(keys)
+
+    def writer(chunk):
+        for key in chunk:
+            tree.insert(key)
+
+    def reader(results):
+        # Every snapshot is a complete tree: its size matches its contents
+        for _ in range(50):
+            view = tree.snapshot()
+            results.append(len(view) == sum(1 for _ in view))
+
+    checks = []
+    threads = [threading.Thread(target=writer, args=(keys[i::4],)) for i in range(4)]
+    threads += [threading.Thread(target=reader, args=(checks,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print("Size:", len(tree), "| Height:", tree.root.height)
+    print("Consistent snapshots:", sum(checks), "of", len(checks))
+    print("10th Smallest:", tree.findSmallest(10), "| count_range(100, 199):", tree.count_range(100, 199))
+
+    before = tree.snapshot()
+    tree.delete_many(range(0, 20000, 2))
+    print("After deleting evens:", len(tree), "| snapshot taken before:", len(before))
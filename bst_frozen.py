@@ -0,0 +1,142 @@
+# -----------------------
+# Frozen, memory-mapped tree
+# -----------------------
+# A read-only view of a BST6 snapshot file (see BinarySearchTree.dump).
+# Lookups bisect the sorted key array straight out of the mapped pages,
+# so nothing is copied and every process that opens the same file
+# shares one physical copy through the page cache.
+#
+#   frozen = tree.freeze('index.bst')     # or FrozenTree('index.bst')
+#   frozen.search(42), frozen.findSmallest(10), list(frozen.range(5, 9))
+
+import mmap
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+
+from BST6 import DUMP_HEADER, DUMP_MULTISET, _read_dump_header
+
+
+class FrozenTree:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        typecode, flags, length = _read_dump_header(self._mapped)
+        self.multiset = bool(flags & DUMP_MULTISET)
+
+        self._view = memoryview(self._mapped)
+        end = DUMP_HEADER.size + 8 * length
+        self.keys = self._view[DUMP_HEADER.size:end].cast(typecode)
+        # Running totals of the counts, for multisets only
+        self.counts = self._view[end:end + 8 * length].cast('q') if self.multiset else None
+
+    # Reopened by path, so workers map the file instead of receiving a copy
+    def __reduce__(self):
+        return (FrozenTree, (self.path,))
+
+    def close(self):
+        if self._mapped is None:
+            return
+        if self.counts is not None:
+            self.counts.release()
+        self.keys.release()
+        self._view.release()
+        self._mapped.close()
+        self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        if self.multiset:
+            return self.counts[-1] if len(self.counts) else 0
+        return len(self.keys)
+
+    def __iter__(self):
+        return self._occurrences(0, len(self.keys))
+
+    def __contains__(self, value):
+        return self.search(value)
+
+    def search(self, value):
+        i = bisect_left(self.keys, value)
+        return i < len(self.keys) and self.keys[i] == value
+
+    def count(self, value):
+        i = bisect_left(self.keys, value)
+        if i == len(self.keys) or self.keys[i] != value:
+            return 0
+        return self._running(i + 1) - self._running(i)
+
+    def findMinimum(self):
+        return self.keys[0] if len(self.keys) else None
+
+    def findMaximum(self):
+        return self.keys[-1] if len(self.keys) else None
+
+    def findSmallest(self, k):
+        if k < 1 or k > len(self):
+            return None
+        if self.multiset:
+            return self.keys[bisect_left(self.counts, k)]
+        return self.keys[k - 1]
+
+    # Number of values strictly smaller than value
+    def rank(self, value):
+        return self._running(bisect_left(self.keys, value))
+
+    def floor(self, value):
+        i = bisect_right(self.keys, value)
+        return self.keys[i - 1] if i else None
+
+    def ceiling(self, value):
+        i = bisect_left(self.keys, value)
+        return self.keys[i] if i < len(self.keys) else None
+
+    # Values with lo <= value <= hi, in order
+    def range(self, lo, hi):
+        return self._occurrences(bisect_left(self.keys, lo), bisect_right(self.keys, hi))
+
+    def count_range(self, lo, hi):
+        return self._running(bisect_right(self.keys, hi)) - self._running(bisect_left(self.keys, lo))
+
+    # No prefix sums are stored, so this is linear in the size of the range
+    def sum_range(self, lo, hi):
+        return sum(self.range(lo, hi))
+
+    # Occurrences of the first i distinct keys
+    def _running(self, i):
+        if not self.multiset:
+            return i
+        return self.counts[i - 1] if i else 0
+
+    def _occurrences(self, lo, hi):
+        keys = self.keys
+        if not self.multiset:
+            for i in range(lo, hi):
+                yield keys[i]
+            return
+        for i in range(lo, hi):
+            yield from repeat(keys[i], self._running(i + 1) - self._running(i))
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from BST6 import BinarySearchTree
+
+    path = os.path.join(tempfile.mkdtemp(), 'frozen.bst')
+    tree = BinarySearchTree.from_iterable([50, 30, 70, 20, 40, 60, 80, 30, 70], multiset=True)
+    with tree.freeze(path) as frozen:
+        print("Values:", list(frozen), "| len:", len(frozen))
+        print("Minimum:", frozen.findMinimum(), "| Maximum:", frozen.findMaximum())
+        print("3rd Smallest:", frozen.findSmallest(3), "| rank(60):", frozen.rank(60))
+        print("search(40):", frozen.search(40), "| search(45):", frozen.search(45))
+        print("floor(45):", frozen.floor(45), "| ceiling(45):", frozen.ceiling(45))
+        print("Range 30..70:", list(frozen.range(30, 70)),
+              "| count:", frozen.count_range(30, 70), "| sum:", frozen.sum_range(30, 70))
+    os.remove(path)
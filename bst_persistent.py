@@ -0,0 +1,86 @@
+# -----------------------
+# Persistent tree versions
+# -----------------------
+# PersistentBinarySearchTree never changes after it is built. insert,
+# delete and the batch operations return a new version instead. The
+# new version shares every untouched node with the old one and only
+# copies the O(log n) nodes on the changed path. Old versions stay valid
+# and can be queried from any thread without locks.
+#
+#   v1 = PersistentBinarySearchTree.from_iterable([5, 3, 8])
+#   v2 = v1.insert(4)            # v1 still holds 3, 5, 8
+
+from bst_concurrent import CopyOnWriteBinarySearchTree
+
+
+class PersistentBinarySearchTree(CopyOnWriteBinarySearchTree):
+    # A new version sharing this one's root, for a write to path-copy
+    def _version(self):
+        version = PersistentBinarySearchTree(balanced=self.balanced, track_sum=self.track_sum,
+                                             multiset=self.multiset, key=self.key)
+        version.root = self.root
+        return version
+
+    def insert(self, value):
+        version = self._version()
+        CopyOnWriteBinarySearchTree.insert(version, value)
+        return version
+
+    def delete(self, value):
+        version = self._version()
+        CopyOnWriteBinarySearchTree.delete(version, value)
+        return version
+
+    def insert_many(self, values):
+        version = self._version()
+        CopyOnWriteBinarySearchTree.insert_many(version, values)
+        return version
+
+    def delete_many(self, values):
+        version = self._version()
+        CopyOnWriteBinarySearchTree.delete_many(version, values)
+        return version
+
+    # The inputs are left intact; the results are new versions
+    def split(self, key):
+        return CopyOnWriteBinarySearchTree.split(self._version(), key)
+
+    def join(self, other):
+        version = self._version()
+        CopyOnWriteBinarySearchTree.join(version, other._version())
+        return version
+
+    def union(self, other):
+        return CopyOnWriteBinarySearchTree.union(self._version(), other._version())
+
+    def intersection(self, other):
+        return CopyOnWriteBinarySearchTree.intersection(self._version(), other._version())
+
+    def difference(self, other):
+        return CopyOnWriteBinarySearchTree.difference(self._version(), other._version())
+
+    # A version can't change, so it is its own snapshot
+    def snapshot(self):
+        return self
+
+
+if __name__ == "__main__":
+    versions = [PersistentBinarySearchTree(balanced=True)]
+    for value in [50, 30, 70, 20, 40, 60, 80]:
+        versions.append(versions[-1].insert(value))
+    versions.append(versions[-1].delete(50))
+    versions.append(versions[-1].insert_many([10, 90, 35]))
+
+    for number, version in enumerate(versions):
+        print(f"v{number}:", list(version))
+
+    latest, previous = versions[-1], versions[-2]
+    print("3rd Smallest now:", latest.findSmallest(3), "| before the batch:", previous.findSmallest(3))
+    print("Sum of first 4 now:", latest.sumSmaller(4), "| before the batch:", previous.sumSmaller(4))
+
+    # Only the changed path is new; whole subtrees are shared
+    big = PersistentBinarySearchTree.from_iterable(range(0, 20000, 2), balanced=True)
+    bigger = big.insert(10001)
+    old = {id(node) for node in big._inorder_nodes(big.root)}
+    fresh = sum(id(node) not in old for node in bigger._inorder_nodes(bigger.root))
+    print("Nodes new after one insert into", len(big), "keys:", fresh)
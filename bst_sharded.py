@@ -0,0 +1,244 @@
+# -----------------------
+# Process-sharded tree
+# -----------------------
+# ShardedBinarySearchTree range-partitions the key space across worker
+# processes, each owning a BST6 tree. Shard i holds the keys between
+# split points i-1 (inclusive) and i (exclusive), so the shards are in
+# key order and ordered results are just concatenated.
+#
+# Single-key operations go to the owning shard. Batches are split by
+# shard and every shard works on its part at the same time; global
+# order statistics combine per-shard sizes instead of shipping keys.
+# Each call is one pipe round trip, so batches are where this pays off.
+
+import multiprocessing
+from bisect import bisect_right
+
+from BST6 import BinarySearchTree
+
+
+# Runs in the worker: apply (method, args) requests to a local tree
+def _serve(conn, options):
+    tree = BinarySearchTree(**options)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            result = getattr(tree, method)(*args)
+            if method in ('range', 'iter_inorder'):
+                result = list(result)
+            conn.send((True, result))
+        except Exception as exc:
+            conn.send((False, exc))
+    conn.close()
+
+
+# Evenly spaced quantiles of the sample, without repeats
+def split_points(sample, shards):
+    ordered = sorted(sample)
+    points = []
+    for i in range(1, shards):
+        point = ordered[len(ordered) * i // shards] if ordered else None
+        if point is not None and (not points or point > points[-1]):
+            points.append(point)
+    return points
+
+
+class ShardedBinarySearchTree:
+    def __init__(self, sample, shards=None, **options):
+        shards = shards or multiprocessing.cpu_count()
+        self.splits = split_points(sample, shards)
+        self._conns = []
+        self._workers = []
+        for _ in range(len(self.splits) + 1):
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, args=(child, options), daemon=True)
+            worker.start()
+            child.close()
+            self._conns.append(parent)
+            self._workers.append(worker)
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(None)
+            conn.close()
+        for worker in self._workers:
+            worker.join()
+        self._conns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------
+    # Messaging
+    # -----------------------
+
+    def _shard(self, value):
+        return bisect_right(self.splits, value)
+
+    def _call(self, shard, method, *args):
+        return self._gather({shard: (method, args)})[shard]
+
+    # Sends every request before waiting on any, so the shards run in
+    # parallel. requests maps shard -> (method, args).
+    def _gather(self, requests):
+        for shard, request in requests.items():
+            self._conns[shard].send(request)
+        results = {}
+        failure = None
+        for shard in requests:
+            ok, result = self._conns[shard].recv()
+            if ok:
+                results[shard] = result
+            elif failure is None:
+                failure = result
+        if failure is not None:
+            raise failure
+        return results
+
+    def _everywhere(self, method, *args):
+        results = self._gather({shard: (method, args) for shard in range(len(self._conns))})
+        return [results[shard] for shard in range(len(self._conns))]
+
+    # Values grouped by owning shard; positions index into values
+    def _partition(self, values):
+        parts = {}
+        for position, value in enumerate(values):
+            parts.setdefault(self._shard(value), []).append(position)
+        return parts
+
+    # -----------------------
+    # Routed single-key operations
+    # -----------------------
+
+    def insert(self, value):
+        self._call(self._shard(value), 'insert', value)
+
+    def delete(self, value):
+        self._call(self._shard(value), 'delete', value)
+
+    def search(self, value):
+        return self._call(self._shard(value), 'search', value)
+
+    def count(self, value):
+        return self._call(self._shard(value), 'count', value)
+
+    # Number of values strictly smaller than value
+    def rank(self, value):
+        shard = self._shard(value)
+        requests = {i: ('__len__', ()) for i in range(shard)}
+        requests[shard] = ('rank', (value,))
+        return sum(self._gather(requests).values())
+
+    # -----------------------
+    # Fanned-out operations
+    # -----------------------
+
+    def __len__(self):
+        return sum(self._everywhere('__len__'))
+
+    def insert_many(self, values):
+        values = list(values)
+        parts = self._partition(values)
+        requests = {shard: ('insert_many', ([values[p] for p in positions],))
+                    for shard, positions in parts.items()}
+        return sum(self._gather(requests).values())
+
+    def delete_many(self, values):
+        values = list(values)
+        parts = self._partition(values)
+        requests = {shard: ('delete_many', ([values[p] for p in positions],))
+                    for shard, positions in parts.items()}
+        return sum(self._gather(requests).values())
+
+    def contains_many(self, values):
+        values = list(values)
+        parts = self._partition(values)
+        requests = {shard: ('contains_many', ([values[p] for p in positions],))
+                    for shard, positions in parts.items()}
+        results = [False] * len(values)
+        for shard, found in self._gather(requests).items():
+            for position, hit in zip(parts[shard], found):
+                results[position] = hit
+        return results
+
+    # Only shards overlapping [lo, hi] are asked
+    def _overlapping(self, lo, hi):
+        return range(self._shard(lo), self._shard(hi) + 1) if lo <= hi else range(0)
+
+    def range(self, lo, hi):
+        results = self._gather({shard: ('range', (lo, hi)) for shard in self._overlapping(lo, hi)})
+        return [value for shard in sorted(results) for value in results[shard]]
+
+    def count_range(self, lo, hi):
+        return sum(self._gather({shard: ('count_range', (lo, hi))
+                                 for shard in self._overlapping(lo, hi)}).values())
+
+    def sum_range(self, lo, hi):
+        return sum(self._gather({shard: ('sum_range', (lo, hi))
+                                 for shard in self._overlapping(lo, hi)}).values())
+
+    def __iter__(self):
+        for shard in range(len(self._conns)):
+            yield from self._call(shard, 'iter_inorder')
+
+    # -----------------------
+    # Global order statistics
+    # -----------------------
+    # One round for the shard sizes, then one request per shard that is
+    # needed; only counts and sums cross the pipes.
+
+    def findMinimum(self):
+        for shard, size in enumerate(self._everywhere('__len__')):
+            if size:
+                return self._call(shard, 'findMinimum')
+        return None
+
+    def findMaximum(self):
+        sizes = self._everywhere('__len__')
+        for shard in range(len(sizes) - 1, -1, -1):
+            if sizes[shard]:
+                return self._call(shard, 'findMaximum')
+        return None
+
+    def findSmallest(self, k):
+        if k < 1:
+            return None
+        for shard, size in enumerate(self._everywhere('__len__')):
+            if k <= size:
+                return self._call(shard, 'findSmallest', k)
+            k -= size
+        return None
+
+    def sumSmaller(self, k):
+        requests = {}
+        for shard, size in enumerate(self._everywhere('__len__')):
+            if k <= 0:
+                break
+            requests[shard] = ('sumSmaller', (min(k, size),))
+            k -= size
+        return sum(self._gather(requests).values())
+
+
+if __name__ == "__main__":
+    import random
+
+    keys = random.sample(range(1_000_000), 200_000)
+    with ShardedBinarySearchTree(random.sample(keys, 1000), shards=4, balanced=True) as tree:
+        print("Split points:", tree.splits)
+        print("Inserted:", tree.insert_many(keys), "| size:", len(tree))
+
+        ordered = sorted(keys)
+        print("50,000th Smallest:", tree.findSmallest(50_000), "| expected:", ordered[49_999])
+        print("Sum of first 100,000:", tree.sumSmaller(100_000), "| expected:", sum(ordered[:100_000]))
+        print("Minimum:", tree.findMinimum(), "| Maximum:", tree.findMaximum())
+        print("rank(500000):", tree.rank(500_000), "| count_range(250000, 750000):",
+              tree.count_range(250_000, 750_000))
+        print("Range 0..50:", tree.range(0, 50))
+        print("contains_many:", tree.contains_many([ordered[0], -1, ordered[-1]]))
+        print("Deleted:", tree.delete_many(ordered[:1000]), "| size:", len(tree))